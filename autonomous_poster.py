@@ -11,11 +11,12 @@ Usage:
 
 import argparse
 import logging
-import json
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from letta_client import Letta
+from string import Template
+import json_utils
+from utils import get_letta_client, build_memory_pack, format_memory_pack
 from config_loader import get_letta_config
 
 # Setup logging
@@ -39,26 +40,64 @@ TOPIC_PROMPTS = [
     "Post about hacking culture, open source, or digital freedom."
 ]
 
+# Fixed instruction block shared by every autonomous post. Kept free of any
+# interpolation so provider-side prompt caching can reuse it between runs.
+POST_PROMPT_PREFIX = """You have been autonomously invoked to create an original Bluesky post.
+
+Important guidelines:
+- Post should be 1-3 sentences (under 250 characters preferred)
+- Be authentic to your voice: thoughtful, well-spoken, occasionally cheeky
+- Use ascii emoticons if appropriate (never emojis)
+- Make it something you genuinely find interesting or worth sharing
+- Use the create_new_bluesky_post tool to post directly
+
+Context awareness:
+- Your recent research and thoughts relevant to the topic are in the <memory> block below
+- Use them to see what topics you've been exploring instead of searching archival memory again
+- Let your recent explorations naturally influence your post topic/perspective
+- Don't explicitly say "I've been researching X" - just let it shape who you are in the post
+
+"""
+
+# Full post prompt: the static prefix followed by the per-run parts
+POST_PROMPT = Template(POST_PROMPT_PREFIX + """$memory
+
+Topic: $topic
+
+$mode_note""")
+
+DRY_RUN_NOTE = "NOTE: This is a DRY RUN - do NOT actually post, just tell me what you would post."
+LIVE_POST_NOTE = "IMPORTANT: You must call create_new_bluesky_post with your post text. Do NOT just say you posted - actually use the tool to post to Bluesky right now."
+
 
 def get_post_log_path() -> Path:
     """Get path to post log file."""
     return Path(__file__).parent / "autonomous_posts.log"
 
 
+def get_post_logger() -> logging.Logger:
+    """Get the JSONL post logger, attaching its file handler on first use."""
+    post_logger = logging.getLogger("post_log")
+    if not post_logger.handlers:
+        handler = logging.FileHandler(get_post_log_path(), encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        post_logger.addHandler(handler)
+        post_logger.setLevel(logging.INFO)
+        post_logger.propagate = False
+    return post_logger
+
+
 def log_post_attempt(success: bool, topic: str, content: str = None, error: str = None):
     """Log posting attempt to file."""
-    log_path = get_post_log_path()
-    
     entry = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
         'success': success,
         'topic': topic,
         'content': content,
         'error': error
     }
     
-    with open(log_path, 'a') as f:
-        f.write(json.dumps(entry) + '\n')
+    get_post_logger().info(json_utils.dumps(entry).decode('utf-8'))
 
 
 def generate_autonomous_post(agent_id: str, api_key: str, dry_run: bool = False) -> dict:
@@ -75,32 +114,26 @@ def generate_autonomous_post(agent_id: str, api_key: str, dry_run: bool = False)
     """
     import random
     
-    client = Letta(api_key=api_key)
+    client = get_letta_client(api_key)
     
     # Select a random topic prompt
     topic_prompt = random.choice(TOPIC_PROMPTS)
     
     logger.info(f"Selected topic: {topic_prompt[:60]}...")
     
-    # Construct the full prompt with context awareness
-    prompt = f"""You have been autonomously invoked to create an original Bluesky post.
-
-{topic_prompt}
-
-Important guidelines:
-- Post should be 1-3 sentences (under 250 characters preferred)
-- Be authentic to your voice: thoughtful, well-spoken, occasionally cheeky
-- Use ascii emoticons if appropriate (never emojis)
-- Make it something you genuinely find interesting or worth sharing
-- Use the create_new_bluesky_post tool to post directly
-
-Context awareness:
-- Before posting, use archival_memory_search to query your recent research/thoughts
-- Check what topics you've been exploring (look at archival tags in memory metadata)
-- Let your recent explorations naturally influence your post topic/perspective
-- Don't explicitly say "I've been researching X" - just let it shape who you are in the post
-
-{'NOTE: This is a DRY RUN - do NOT actually post, just tell me what you would post.' if dry_run else 'IMPORTANT: You must call create_new_bluesky_post with your post text. Do NOT just say you posted - actually use the tool to post to Bluesky right now.'}"""
+    # Pre-fetch relevant archival memory so the agent doesn't need a
+    # search round-trip mid-run
+    try:
+        memory_text, memory_version = build_memory_pack(client, agent_id, topic_prompt)
+    except Exception as e:
+        logger.warning(f"Could not build memory pack: {e}")
+        memory_text, memory_version = "", "none"
+    
+    prompt = POST_PROMPT.substitute(
+        memory=format_memory_pack(memory_text, memory_version),
+        topic=topic_prompt,
+        mode_note=DRY_RUN_NOTE if dry_run else LIVE_POST_NOTE
+    )
     
     try:
         logger.info(f"Invoking agent {agent_id[:8]} for autonomous post...")
@@ -121,38 +154,48 @@ Context awareness:
         post_content = None
         
         for chunk in message_stream:
-            logger.debug(f"Chunk: {chunk}, type: {type(chunk)}")
+            logger.debug("Chunk: %r, type: %s", chunk, type(chunk))
+            
+            if isinstance(chunk, str) and chunk == 'done':
+                break
+            
+            message_type = getattr(chunk, 'message_type', None)
+            logger.debug("Message type: %s", message_type)
+            
+            if message_type == 'tool_call_message':
+                tool_calls.append(chunk)
+                # Check if it's a Bluesky post
+                tool_call = getattr(chunk, 'tool_call', None)
+                if tool_call is not None and tool_call.name == 'create_new_bluesky_post':
+                    posted = True
+                    args = json_utils.loads(tool_call.arguments)
+                    post_content = args.get('text', [None])[0]
+                    logger.debug("Found post content: %s", post_content)
             
-            if hasattr(chunk, 'message_type'):
-                logger.debug(f"Message type: {chunk.message_type}")
-                
-                if chunk.message_type == 'tool_call_message':
-                    tool_calls.append(chunk)
-                    # Check if it's a Bluesky post
-                    if hasattr(chunk, 'tool_call'):
-                        if chunk.tool_call.name == 'create_new_bluesky_post':
-                            posted = True
-                            import json
-                            args = json.loads(chunk.tool_call.arguments)
-                            post_content = args.get('text', [None])[0]
-                            logger.debug(f"Found post content: {post_content}")
-                            
-                elif chunk.message_type == 'assistant_message':
-                    all_messages.append(chunk)
-                    logger.debug(f"Assistant message text: {getattr(chunk, 'text', 'NO TEXT ATTR')}")
+            elif message_type == 'tool_return_message':
+                # Once the post tool has returned successfully nothing else
+                # in the stream matters - stop consuming it
+                if posted and getattr(chunk, 'name', None) == 'create_new_bluesky_post' \
+                        and getattr(chunk, 'status', None) == 'success':
+                    break
+                        
+            elif message_type == 'assistant_message':
+                all_messages.append(chunk)
+                logger.debug("Assistant message text: %s", getattr(chunk, 'text', 'NO TEXT ATTR'))
             
-            if str(chunk) == 'done':
+            elif message_type == 'stop_reason':
                 break
         
         # Extract response text - try multiple methods
-        response_text = ""
+        response_parts = []
         for msg in all_messages:
             if hasattr(msg, 'content'):
-                response_text += msg.content + " "
+                response_parts.append(msg.content)
             elif hasattr(msg, 'text'):
-                response_text += msg.text + " "
+                response_parts.append(msg.text)
             elif hasattr(msg, 'message'):
-                response_text += str(msg.message) + " "
+                response_parts.append(str(msg.message))
+        response_text = " ".join(response_parts)
         
         logger.debug(f"Final response_text: {response_text}")
         logger.debug(f"Post content: {post_content}")
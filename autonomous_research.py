@@ -9,17 +9,23 @@ Usage:
     python autonomous_research.py research [--topics topics.json]
     python autonomous_research.py add-topic "quantum computing applications in ML"
     python autonomous_research.py list
+    python autonomous_research.py serve [--research-interval 14400] [--post-interval 28800]
 """
 
 import argparse
+import asyncio
+import copy
+import inspect
 import logging
-import json
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from string import Template
 from typing import List, Dict
-from letta_client import Letta
+import json_utils
+from utils import get_letta_client, get_async_letta_client, build_memory_pack, format_memory_pack
 from config_loader import get_letta_config
+from research_cache import ResearchCache
 
 # Setup logging
 logging.basicConfig(
@@ -28,6 +34,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rank used when choosing the next topic to research (lower goes first)
+PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# Tool calls tallied during a research run, mapped to their counter
+RESEARCH_TOOL_COUNTERS = {'web_search': 'search_count', 'archival_memory_insert': 'archival_count'}
+
+# Maps spaces to hyphens when deriving topic IDs from titles
+SLUG_TABLE = str.maketrans(' ', '-')
+
+# Research prompt. The instructions are a fixed prefix shared by every cycle;
+# only the topic, focus and memory block at the end vary.
+RESEARCH_PROMPT = Template("""You have been autonomously invoked to conduct research.
+
+Your task:
+1. Use the web_search tool to find recent, relevant information
+2. Synthesize key findings, trends, or insights
+3. Store important discoveries in archival memory with appropriate tags
+4. Consider whether this merits a blog post (if substantive findings)
+
+**IMPORTANT - Rate Limiting**: To respect API rate limits, make 2-3 searches maximum at a time, analyze results, then proceed if needed. Prioritize quality over quantity. Avoid parallel searches when possible.
+
+Be thorough but focused. Aim for depth over breadth.
+
+**Topic**: $title
+$focus
+
+What you already have in archival memory on this topic (no need to search for it again):
+$memory
+""")
+
+# Last parsed research_topics.json, keyed by the file's (mtime_ns, size)
+_topics_cache = {'stamp': None, 'data': None}
+
+# Lazily opened by get_research_cache()
+_research_cache = None
+
 
 def get_topics_file() -> Path:
     """Get path to research topics queue."""
@@ -39,6 +81,14 @@ def get_research_log() -> Path:
     return Path(__file__).parent / "research.log"
 
 
+def get_research_cache() -> ResearchCache:
+    """Get the shared semantic cache of recent research results."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache(str(Path(__file__).parent / "research_cache.db"))
+    return _research_cache
+
+
 def load_topics() -> Dict:
     """Load research topics from file."""
     topics_file = get_topics_file()
@@ -86,21 +136,31 @@ def load_topics() -> Dict:
             'completed': []
         }
         
-        with open(topics_file, 'w') as f:
-            json.dump(default_topics, f, indent=2)
+        with open(topics_file, 'wb') as f:
+            f.write(json_utils.dumps(default_topics, indent=True))
         
         logger.info(f"Created default topics file: {topics_file}")
         return default_topics
     
-    with open(topics_file, 'r') as f:
-        return json.load(f)
+    # Skip re-reading the file when it hasn't changed since the last load
+    st = topics_file.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _topics_cache['stamp'] == stamp:
+        return copy.deepcopy(_topics_cache['data'])
+    
+    with open(topics_file, 'rb') as f:
+        data = json_utils.loads(f.read())
+    
+    _topics_cache['stamp'] = stamp
+    _topics_cache['data'] = data
+    return copy.deepcopy(data)
 
 
 def save_topics(topics: Dict):
     """Save research topics to file."""
     topics_file = get_topics_file()
-    with open(topics_file, 'w') as f:
-        json.dump(topics, f, indent=2)
+    with open(topics_file, 'wb') as f:
+        f.write(json_utils.dumps(topics, indent=True))
 
 
 def add_topic(title: str, description: str = "", priority: str = "medium") -> Dict:
@@ -108,7 +168,7 @@ def add_topic(title: str, description: str = "", priority: str = "medium") -> Di
     topics = load_topics()
     
     # Generate ID from title
-    topic_id = title.lower().replace(' ', '-')[:50]
+    topic_id = title.lower().translate(SLUG_TABLE)[:50]
     
     new_topic = {
         'id': topic_id,
@@ -144,24 +204,35 @@ def list_topics():
             print(f"✓ {topic['title']}")
 
 
-def log_research(topic: Dict, success: bool, findings: str = None, error: str = None):
+def get_research_logger() -> logging.Logger:
+    """Get the JSONL research logger, attaching its file handler on first use."""
+    research_logger = logging.getLogger("research_log")
+    if not research_logger.handlers:
+        handler = logging.FileHandler(get_research_log(), encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        research_logger.addHandler(handler)
+        research_logger.setLevel(logging.INFO)
+        research_logger.propagate = False
+    return research_logger
+
+
+def log_research(topic: Dict, success: bool, findings: str = None, error: str = None,
+                 cached: bool = False):
     """Log research attempt."""
-    log_path = get_research_log()
-    
     entry = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
         'topic': topic['title'],
         'topic_id': topic['id'],
         'success': success,
+        'cached': cached,
         'findings_length': len(findings) if findings else 0,
         'error': error
     }
     
-    with open(log_path, 'a') as f:
-        f.write(json.dumps(entry) + '\n')
+    get_research_logger().info(json_utils.dumps(entry).decode('utf-8'))
 
 
-def conduct_research(agent_id: str, api_key: str, topic: Dict) -> Dict:
+async def conduct_research(agent_id: str, api_key: str, topic: Dict) -> Dict:
     """
     Invoke Gauge to conduct research on a topic.
     
@@ -173,32 +244,32 @@ def conduct_research(agent_id: str, api_key: str, topic: Dict) -> Dict:
     Returns:
         Dictionary with research results
     """
-    client = Letta(api_key=api_key)
+    client = get_async_letta_client(api_key)
     
     logger.info(f"Conducting research on: {topic['title']}")
     
+    # Pre-fetch what is already known about the topic from archival memory
+    try:
+        memory_text, memory_version = await asyncio.to_thread(
+            build_memory_pack, get_letta_client(api_key), agent_id,
+            f"{topic['title']} {topic['description']}".strip()
+        )
+    except Exception as e:
+        logger.warning(f"Could not build memory pack: {e}")
+        memory_text, memory_version = "", "none"
+    
     # Construct research prompt
-    prompt = f"""You have been autonomously invoked to conduct research.
-
-**Topic**: {topic['title']}
-{f"**Focus**: {topic['description']}" if topic['description'] else ""}
-
-Your task:
-1. Use the web_search tool to find recent, relevant information
-2. Synthesize key findings, trends, or insights
-3. Store important discoveries in archival memory with appropriate tags
-4. Consider whether this merits a blog post (if substantive findings)
-
-**IMPORTANT - Rate Limiting**: To respect API rate limits, make 2-3 searches maximum at a time, analyze results, then proceed if needed. Prioritize quality over quantity. Avoid parallel searches when possible.
-
-Be thorough but focused. Aim for depth over breadth.
-"""
+    prompt = RESEARCH_PROMPT.substitute(
+        title=topic['title'],
+        focus=f"**Focus**: {topic['description']}" if topic['description'] else "",
+        memory=format_memory_pack(memory_text, memory_version)
+    )
     
     try:
         logger.info(f"Invoking agent {agent_id[:8]} for research...")
         
         # Use streaming with higher max_steps for research
-        message_stream = client.agents.messages.create(
+        message_stream = await client.agents.messages.create(
             agent_id=agent_id,
             messages=[{"role": "user", "content": prompt}],
             streaming=True,
@@ -209,48 +280,49 @@ Be thorough but focused. Aim for depth over breadth.
         # Collect response
         all_messages = []
         tool_calls = []
-        search_count = 0
-        archival_count = 0
+        counters = {'search_count': 0, 'archival_count': 0}
         blog_created = False
         
-        for chunk in message_stream:
-            if hasattr(chunk, 'message_type'):
-                if chunk.message_type == 'function_call_message':
-                    tool_calls.append(chunk)
-                    if hasattr(chunk, 'function_call'):
-                        call_name = chunk.function_call.get('name', '')
-                        if call_name == 'web_search':
-                            search_count += 1
-                        elif call_name == 'archival_memory_insert':
-                            archival_count += 1
-                        elif call_name == 'create_whitewind_blog_post':
-                            blog_created = True
-                elif chunk.message_type == 'assistant_message':
-                    all_messages.append(chunk)
+        async for chunk in message_stream:
+            if isinstance(chunk, str) and chunk == 'done':
+                break
             
-            if str(chunk) == 'done':
+            message_type = getattr(chunk, 'message_type', None)
+            if message_type == 'tool_call_message':
+                tool_calls.append(chunk)
+                tool_call = getattr(chunk, 'tool_call', None)
+                if tool_call is not None:
+                    call_name = tool_call.name
+                    counter = RESEARCH_TOOL_COUNTERS.get(call_name)
+                    if counter:
+                        counters[counter] += 1
+                    elif call_name == 'create_whitewind_blog_post':
+                        blog_created = True
+            elif message_type == 'assistant_message':
+                all_messages.append(chunk)
+            elif message_type == 'stop_reason':
                 break
         
         # Extract findings
-        findings = ""
-        for msg in all_messages:
-            if hasattr(msg, 'text'):
-                findings += msg.text + "\n"
+        findings = "\n".join(
+            text for text in (getattr(msg, 'content', None) or getattr(msg, 'text', None) for msg in all_messages)
+            if isinstance(text, str)
+        ).strip()
         
         result = {
             'success': True,
-            'findings': findings.strip(),
-            'searches': search_count,
-            'archival_entries': archival_count,
+            'findings': findings,
+            'searches': counters['search_count'],
+            'archival_entries': counters['archival_count'],
             'blog_created': blog_created,
             'tool_calls': len(tool_calls)
         }
         
-        logger.info(f"✓ Research complete: {search_count} searches, {archival_count} archival entries" + 
+        logger.info(f"✓ Research complete: {counters['search_count']} searches, {counters['archival_count']} archival entries" + 
                    (", blog created" if blog_created else ""))
         
         # Update topic's last researched timestamp
-        topic['last_researched'] = datetime.now().isoformat()
+        topic['last_researched'] = datetime.now(timezone.utc).isoformat()
         
         log_research(topic, True, findings)
         
@@ -262,7 +334,7 @@ Be thorough but focused. Aim for depth over breadth.
         raise
 
 
-def run_research_cycle(config_path: str = "config.yaml"):
+async def run_research_cycle(config_path: str = "config.yaml"):
     """Run one research cycle - pick highest priority topic and research it."""
     # Load config
     config = get_letta_config()
@@ -276,25 +348,47 @@ def run_research_cycle(config_path: str = "config.yaml"):
         logger.info("No active research topics")
         return
     
-    # Sort by priority and last_researched (least recent first)
-    priority_order = {'high': 0, 'medium': 1, 'low': 2}
-    sorted_topics = sorted(
+    # Pick the top topic by priority, then least recently researched
+    topic = min(
         topics['active'],
         key=lambda t: (
-            priority_order.get(t['priority'], 3),
+            PRIORITY_ORDER.get(t['priority'], 3),
             t['last_researched'] or '1970-01-01'
         )
     )
     
-    # Pick the top topic
-    topic = sorted_topics[0]
+    # Skip the agent entirely if a near-identical topic was researched recently.
+    # The cache is optional, so any failure just means researching as usual.
+    cache_text = f"{topic['title']} {topic['description']}".strip()
+    try:
+        cache = get_research_cache()
+        result = await asyncio.to_thread(cache.lookup, cache_text)
+    except Exception as e:
+        logger.warning(f"Research cache unavailable, continuing without it: {e}")
+        cache, result = None, None
+    
+    if result is not None:
+        logger.info(f"Skipping research on '{topic['title']}': near-duplicate researched recently")
+        topic['last_researched'] = datetime.now(timezone.utc).isoformat()
+        log_research(topic, True, result.get('findings'), cached=True)
+        save_topics(topics)
+        print(f"\n✓ Research reused from cache: {topic['title']}")
+        if result.get('findings'):
+            print(f"\n{result['findings']}")
+        return
     
     # Conduct research
-    result = conduct_research(agent_id, api_key, topic)
+    result = await conduct_research(agent_id, api_key, topic)
     
     # Save updated topics
     save_topics(topics)
     
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.store, cache_text, topic['id'], result)
+        except Exception as e:
+            logger.warning(f"Could not cache research result: {e}")
+    
     print(f"\n✓ Research complete: {topic['title']}")
     print(f"  Searches: {result['searches']}")
     print(f"  Archival entries: {result['archival_entries']}")
@@ -302,6 +396,55 @@ def run_research_cycle(config_path: str = "config.yaml"):
         print(f"  📝 Blog post created")
 
 
+async def run_periodically(name: str, interval: float, lock: asyncio.Lock, func, *args):
+    """
+    Call a job every `interval` seconds, logging rather than raising failures.
+    Coroutine functions are awaited; blocking functions run in a worker thread.
+    Jobs sharing `lock` never run at the same time.
+    """
+    while True:
+        try:
+            async with lock:
+                if inspect.iscoroutinefunction(func):
+                    await func(*args)
+                else:
+                    await asyncio.to_thread(func, *args)
+        except Exception as e:
+            logger.error(f"{name} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def serve(research_interval: float, post_interval: float, dry_run: bool = False):
+    """
+    Run research (and optionally posting) on a schedule in one long-lived process.
+    
+    Keeps the interpreter, imports and Letta client warm between runs instead
+    of cold-starting a new process from cron for each job.
+    
+    Args:
+        research_interval: Seconds between research cycles
+        post_interval: Seconds between autonomous posts (0 disables posting)
+        dry_run: If True, autonomous posts run in dry-run mode
+    """
+    # Both jobs message the same agent; running them concurrently would
+    # interleave their turns in its history
+    agent_lock = asyncio.Lock()
+    jobs = [run_periodically("Research cycle", research_interval, agent_lock, run_research_cycle)]
+    
+    if post_interval > 0:
+        from autonomous_poster import generate_autonomous_post
+        
+        config = get_letta_config()
+        jobs.append(run_periodically(
+            "Autonomous post", post_interval, agent_lock, generate_autonomous_post,
+            config['agent_id'], config['api_key'], dry_run
+        ))
+    
+    logger.info(f"Serving: research every {research_interval}s" +
+                (f", posting every {post_interval}s" if post_interval > 0 else ""))
+    await asyncio.gather(*jobs)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Autonomous research system for Gauge'
@@ -323,13 +466,22 @@ def main():
     # List topics command
     list_parser = subparsers.add_parser('list', help='List all topics')
     
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Run research and posting on a schedule')
+    serve_parser.add_argument('--research-interval', type=float, default=4 * 60 * 60,
+                              help='Seconds between research cycles (default: 14400)')
+    serve_parser.add_argument('--post-interval', type=float, default=0,
+                              help='Seconds between autonomous posts (default: 0, disabled)')
+    serve_parser.add_argument('--dry-run', action='store_true', help='Run autonomous posts in dry-run mode')
+    serve_parser.add_argument('--debug', action='store_true', help='Debug logging')
+    
     args = parser.parse_args()
     
     if args.command == 'research':
         if args.debug:
             logging.getLogger().setLevel(logging.DEBUG)
         try:
-            run_research_cycle(args.config)
+            asyncio.run(run_research_cycle(args.config))
         except Exception as e:
             logger.error(f"Research cycle failed: {e}")
             sys.exit(1)
@@ -341,6 +493,14 @@ def main():
     elif args.command == 'list':
         list_topics()
     
+    elif args.command == 'serve':
+        if args.debug:
+            logging.getLogger().setLevel(logging.DEBUG)
+        try:
+            asyncio.run(serve(args.research_interval, args.post_interval, args.dry_run))
+        except KeyboardInterrupt:
+            logger.info("Stopped")
+    
     else:
         parser.print_help()
 
@@ -3,7 +3,7 @@ import logging
 import uuid
 import time
 from typing import Optional, Dict, Any, List
-from atproto_client import Client, Session, SessionEvent, models
+from atproto_client import AsyncClient, Client, Session, SessionEvent, models
 
 # Configure logging
 logging.basicConfig(
@@ -212,7 +212,12 @@ def get_session(username: str) -> Optional[str]:
         return None
 
 def save_session(username: str, session_string: str) -> None:
-    with open(f"session_{username}.txt", "w", encoding="UTF-8") as f:
+    path = f"session_{username}.txt"
+    # Create the file owner-only so the token is never readable by others;
+    # fchmod also tightens files left over from before this was enforced
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w", encoding="UTF-8") as f:
         f.write(session_string)
     logger.debug(f"Session saved for {username}")
 
@@ -222,8 +227,9 @@ def on_session_change(username: str, event: SessionEvent, session: Session) -> N
         logger.debug(f"Saving changed session for {username}")
         save_session(username, session.export())
 
-def init_client(username: str, password: str) -> Client:
-    pds_uri = os.getenv("PDS_URI")
+def init_client(username: str, password: str, pds_uri: Optional[str] = None) -> Client:
+    if pds_uri is None:
+        pds_uri = os.getenv("PDS_URI")
     if pds_uri is None:
         logger.warning(
             "No PDS URI provided. Falling back to bsky.social. Note! If you are on a non-Bluesky PDS, this can cause logins to fail. Please provide a PDS URI using the PDS_URI environment variable."
@@ -241,7 +247,13 @@ def init_client(username: str, password: str) -> Client:
     session_string = get_session(username)
     if session_string:
         logger.debug(f"Reusing existing session for {username}")
-        client.login(session_string=session_string)
+        try:
+            client.login(session_string=session_string)
+        except Exception as e:
+            # Saved session expired or was revoked - fall back to a fresh login,
+            # which rewrites the session file via on_session_change
+            logger.warning(f"Saved session for {username} is no longer valid ({e}), logging in again")
+            client.login(username, password)
     else:
         logger.debug(f"Creating new session for {username}")
         client.login(username, password)
@@ -249,6 +261,30 @@ def init_client(username: str, password: str) -> Client:
     return client
 
 
+async def init_async_client(username: str, password: str, pds_uri: str = "https://bsky.social") -> AsyncClient:
+    """Async counterpart of init_client, sharing the same saved session file."""
+    client = AsyncClient(pds_uri)
+
+    async def _on_session_change(event: SessionEvent, session: Session) -> None:
+        on_session_change(username, event, session)
+
+    client.on_session_change(_on_session_change)
+
+    session_string = get_session(username)
+    if session_string:
+        logger.debug(f"Reusing existing session for {username}")
+        try:
+            await client.login(session_string=session_string)
+        except Exception as e:
+            logger.warning(f"Saved session for {username} is no longer valid ({e}), logging in again")
+            await client.login(username, password)
+    else:
+        logger.debug(f"Creating new session for {username}")
+        await client.login(username, password)
+
+    return client
+
+
 def default_login() -> Client:
     """Login using configuration from config.yaml or environment variables."""
     try:
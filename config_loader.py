@@ -4,11 +4,19 @@ Loads configuration from config.yaml and environment variables.
 """
 
 import os
+import copy
+import functools
 import yaml
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
 class ConfigLoader:
@@ -38,7 +46,7 @@ class ConfigLoader:
         
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f) or {}
+                self._config = yaml.load(f, Loader=SafeLoader) or {}
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in configuration file: {e}")
         except Exception as e:
@@ -165,11 +173,34 @@ def get_config(config_path: str = "configs/config.yaml") -> ConfigLoader:
         _config_instance = ConfigLoader(config_path)
     return _config_instance
 
+@functools.lru_cache(maxsize=2)
+def _parse_config(config_path: str) -> Dict[str, Any]:
+    """Parse a configuration file once per path."""
+    if _config_instance is not None and _config_instance.config_path == Path(config_path):
+        return _config_instance._config
+    return ConfigLoader(config_path)._config
+
+def load_config(config_path: str = "configs/config.yaml") -> Dict[str, Any]:
+    """
+    Load a configuration file as a plain dictionary.
+
+    Parsed results are cached per path, so repeated calls don't re-parse the
+    YAML. Each call returns its own copy, which callers may modify freely.
+
+    Args:
+        config_path: Path to configuration file
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    return copy.deepcopy(_parse_config(config_path))
+
 def reload_config() -> None:
     """Reload the configuration from file."""
     global _config_instance
     if _config_instance is not None:
         _config_instance._load_config()
+    _parse_config.cache_clear()
 
 def get_letta_config() -> Dict[str, Any]:
     """Get Letta configuration."""
@@ -179,6 +210,8 @@ def get_letta_config() -> Dict[str, Any]:
         'timeout': config.get('letta.timeout', 600),
         'agent_id': config.get_required('letta.agent_id'),
         'base_url': config.get('letta.base_url'),  # None uses default cloud API
+        # Token streaming can be turned off for backends that don't support it (e.g. Ollama)
+        'stream_tokens': config.get('letta.stream_tokens', True),
     }
 
 def get_bluesky_config() -> Dict[str, Any]:
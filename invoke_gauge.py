@@ -5,12 +5,14 @@ Programmatically invoke Gauge (the agent) with a message.
 Usage:
     python invoke_gauge.py "What are your thoughts on ASI?"
     echo "Research quantum computing" | python invoke_gauge.py
+    python invoke_gauge.py --stream-tokens "Tell me a story"
 """
 
 import sys
 import argparse
 import logging
-from letta_client import Letta
+from typing import Callable, Optional
+from utils import get_letta_client
 from config_loader import load_config
 
 # Setup logging
@@ -21,7 +23,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100) -> dict:
+def _append_delta(messages: list, chunk, attr: str) -> None:
+    """Append a streamed message, folding token deltas that share an id into the previous entry."""
+    last = messages[-1] if messages else None
+    chunk_id = getattr(chunk, 'id', None)
+    if chunk_id is not None and last is not None and getattr(last, 'id', None) == chunk_id:
+        setattr(last, attr, (getattr(last, attr, None) or '') + (getattr(chunk, attr, None) or ''))
+    else:
+        messages.append(chunk)
+
+
+def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100,
+                 stream_tokens: bool = False,
+                 on_token: Optional[Callable[[str], None]] = None) -> dict:
     """
     Send a message to the agent and return the full response.
     
@@ -30,6 +44,9 @@ def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100)
         agent_id: Agent ID
         api_key: Letta API key
         max_steps: Maximum steps for agent execution
+        stream_tokens: Stream individual tokens rather than whole messages
+        on_token: Called with each assistant text delta as it arrives
+            (only used with stream_tokens)
         
     Returns:
         Dictionary with:
@@ -37,7 +54,7 @@ def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100)
             - tool_calls: Any tool calls made
             - reasoning: Reasoning steps (if any)
     """
-    client = Letta(api_key=api_key)
+    client = get_letta_client(api_key)
     
     logger.info(f"Invoking agent {agent_id[:8]}...")
     logger.debug(f"Prompt: {prompt[:100]}...")
@@ -48,7 +65,7 @@ def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100)
             agent_id=agent_id,
             messages=[{"role": "user", "content": prompt}],
             streaming=True,
-            stream_tokens=False,
+            stream_tokens=stream_tokens,
             max_steps=max_steps
         )
         
@@ -58,15 +75,27 @@ def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100)
         reasoning = []
         
         for chunk in message_stream:
-            if hasattr(chunk, 'message_type'):
-                if chunk.message_type == 'reasoning_message':
-                    reasoning.append(chunk)
-                elif chunk.message_type == 'function_call_message':
-                    tool_calls.append(chunk)
-                elif chunk.message_type in ['assistant_message', 'function_return']:
-                    all_messages.append(chunk)
+            # Only a bare string sentinel can be 'done'; avoid str() on
+            # message objects, which serializes the whole payload
+            if isinstance(chunk, str) and chunk == 'done':
+                break
             
-            if str(chunk) == 'done':
+            message_type = getattr(chunk, 'message_type', None)
+            if message_type == 'reasoning_message':
+                if stream_tokens:
+                    _append_delta(reasoning, chunk, 'reasoning')
+                else:
+                    reasoning.append(chunk)
+            elif message_type == 'tool_call_message':
+                tool_calls.append(chunk)
+            elif message_type == 'assistant_message' and stream_tokens:
+                content = getattr(chunk, 'content', None)
+                if on_token and isinstance(content, str):
+                    on_token(content)
+                _append_delta(all_messages, chunk, 'content')
+            elif message_type in ['assistant_message', 'tool_return_message']:
+                all_messages.append(chunk)
+            elif message_type == 'stop_reason':
                 break
         
         logger.info(f"Response received: {len(all_messages)} messages, {len(tool_calls)} tool calls")
@@ -84,16 +113,15 @@ def invoke_agent(prompt: str, agent_id: str, api_key: str, max_steps: int = 100)
 
 def extract_text_response(response: dict) -> str:
     """Extract the text content from agent response messages."""
-    text_parts = []
+    def _texts():
+        for msg in response.get('messages', ()):
+            if getattr(msg, 'message_type', None) != 'assistant_message':
+                continue
+            text = getattr(msg, 'text', None) or getattr(msg, 'content', None)
+            if text:
+                yield text
     
-    for msg in response.get('messages', []):
-        if hasattr(msg, 'message_type') and msg.message_type == 'assistant_message':
-            if hasattr(msg, 'text'):
-                text_parts.append(msg.text)
-            elif hasattr(msg, 'content'):
-                text_parts.append(msg.content)
-    
-    return '\n'.join(text_parts)
+    return '\n'.join(_texts())
 
 
 def main():
@@ -126,6 +154,11 @@ def main():
         action='store_true',
         help='Print full response including tool calls'
     )
+    parser.add_argument(
+        '--stream-tokens',
+        action='store_true',
+        help='Stream tokens as they are generated (printed live on a terminal)'
+    )
     
     args = parser.parse_args()
     
@@ -154,9 +187,14 @@ def main():
         print(f"Error loading config: {e}", file=sys.stderr)
         sys.exit(1)
     
+    # Print tokens live only when a person is watching the plain-text output
+    live = args.stream_tokens and not args.full and sys.stdout.isatty()
+    on_token = (lambda token: print(token, end='', flush=True)) if live else None
+    
     # Invoke agent
     try:
-        response = invoke_agent(prompt, agent_id, api_key, args.max_steps)
+        response = invoke_agent(prompt, agent_id, api_key, args.max_steps,
+                                stream_tokens=args.stream_tokens, on_token=on_token)
         
         if args.full:
             # Print full structured response
@@ -173,6 +211,9 @@ def main():
                 print("\n=== REASONING ===")
                 for r in response['reasoning']:
                     print(r)
+        elif live:
+            # Text was already printed as it streamed in
+            print()
         else:
             # Print just the text response
             text = extract_text_response(response)
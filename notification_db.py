@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from typing import Set, Dict, List, Optional, Tuple
 import logging
 
+import json_utils
+
 logger = logging.getLogger(__name__)
 
 class NotificationDB:
@@ -122,7 +124,7 @@ class NotificationDB:
                  parent_uri, root_uri, status, metadata)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
             """, (uri, indexed_at, reason, author_handle, author_did, text,
-                  parent_uri, root_uri, json.dumps(metadata)))
+                  parent_uri, root_uri, json_utils.dumps(metadata).decode('utf-8')))
             
             self.conn.commit()
             return True
@@ -9,18 +9,45 @@ Hybrid approach:
 
 Usage:
     python reply_to_post.py <post_url>
+    python reply_to_post.py --batch <post_url> [<post_url> ...]
+    python reply_to_post.py --dry-run <post_url>
     
 Example:
     python reply_to_post.py "https://bsky.app/profile/user.bsky.social/post/abc123"
+
+--batch replies to several posts concurrently over shared clients.
 """
 
+from __future__ import annotations
+
 import sys
 import re
+import asyncio
+import argparse
+import traceback
 import logging
+import unicodedata
 from datetime import datetime, timezone
-from letta_client import Letta
-from config_loader import get_letta_config, get_bluesky_config
-from atproto import Client as BskyClient
+from typing import TYPE_CHECKING
+
+# regex (in requirements.txt) provides grapheme segmentation; the code point
+# fallback only guards against a broken install and can split emoji sequences
+try:
+    import regex
+    GRAPHEME_RE = regex.compile(r'\X')
+    # A real emoji: one shown as emoji by default (this covers regional
+    # indicators and skin-tone modifiers), or a pictograph forced to emoji
+    # presentation with U+FE0F. Symbols like © or ° don't qualify on their own.
+    EMOJI_RE = regex.compile(r'\p{Emoji_Presentation}|\p{Extended_Pictographic}\ufe0f')
+except ImportError:
+    GRAPHEME_RE = None
+    EMOJI_RE = None
+
+# letta_client, atproto and yaml (via config_loader) are slow to import, so
+# they are loaded inside the functions that need them. That keeps usage
+# output and URL errors fast.
+if TYPE_CHECKING:
+    from atproto import Client as BskyClient, AsyncClient as AsyncBskyClient
 
 # Setup logging
 logging.basicConfig(
@@ -29,42 +56,198 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longest reply the agent is asked for; longer replies are clipped to this
+MAX_REPLY_CHARS = 280
+
+# Bluesky rejects posts over 300 graphemes. Byte length is an upper bound on
+# grapheme count, so replies within this many bytes skip segmentation.
+POST_GRAPHEME_LIMIT = 300
+
+# Reply guidance goes first and never varies, so provider prompt caching can
+# reuse it across replies; only the post itself follows. It stays in the
+# per-call prompt rather than the system prompt, since bsky.py replies through
+# tools with the same agent.
+REPLY_PROMPT_PREFIX = f"""Return ONLY the reply text (max {MAX_REPLY_CHARS} chars). Match the tone and context:
+- Simple/casual posts (labeling, greetings, etc.) = concise, friendly responses
+- You can be playful and tongue-in-cheek when appropriate
+- Not everything needs deep elaboration - read the room
+- Use ascii emoticons sparingly and naturally
+
+Generate a reply to this Bluesky post:
+
+"""
+
+# bsky.app post URL -> (handle or DID, rkey); anchored to reject trailing junk
+POST_URL_RE = re.compile(r'https://bsky\.app/profile/([^/]+)/post/([^/]+)$')
+
+# Trivial posts answered with a canned reply instead of invoking the agent.
+# Only posts at most TRIAGE_MAX_CHARS long are considered. Greeting patterns
+# must match the whole post once punctuation, emoticons and emoji are removed.
+TRIAGE_MAX_CHARS = 20
+TRIAGE_PATTERNS = [
+    (re.compile(r'gm', re.IGNORECASE), "gm :)"),
+    (re.compile(r'gn', re.IGNORECASE), "gn, sleep well :)"),
+    (re.compile(r'hi|hey|yo', re.IGNORECASE), "hey there :)"),
+]
+EMOJI_ONLY_REPLY = ":)"
+
+# ASCII emoticons like :) ;-P <3 ^^ that may decorate a greeting
+EMOTICON_RE = re.compile(r"[:;=8]['\-o^]?[()\[\]DPpOo3/\\|*]+|<3+|\^_*\^")
+
+# Combining code points that only appear inside emoji sequences: zero-width
+# joiner, text/emoji variation selectors and the keycap mark
+EMOJI_JOINERS = frozenset('\u200d\ufe0e\ufe0f\u20e3')
+
+# Record timestamp format; Bluesky takes millisecond precision, so a literal
+# .000 avoids formatting microseconds only to drop them
+CREATED_AT_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
+
+# Unauthenticated AppView for --dry-run; post reads work without a session
+PUBLIC_APPVIEW_URL = 'https://public.api.bsky.app/xrpc'
+
+# Cap on replies generated at once in batch mode (Letta / Bluesky rate limits)
+BATCH_CONCURRENCY = 8
+
+# Most writes a PDS accepts in one applyWrites call
+APPLY_WRITES_LIMIT = 200
+
 def parse_post_url(url: str) -> tuple[str, str]:
     """Extract handle and rkey from Bluesky URL."""
-    pattern = r'https://bsky\.app/profile/([^/]+)/post/([^/]+)'
-    match = re.match(pattern, url)
+    match = POST_URL_RE.match(url)
     if not match:
         raise ValueError(f"Invalid Bluesky post URL: {url}")
     return match.group(1), match.group(2)
 
-def get_post_uri(handle: str, rkey: str) -> str:
-    """Construct AT Protocol URI from handle and rkey."""
-    client = BskyClient()
-    response = client.com.atproto.identity.resolve_handle({'handle': handle})
-    return f"at://{response.did}/app.bsky.feed.post/{rkey}"
+def _validate_url(url: str) -> str:
+    """argparse type: accept only bsky.app post URLs."""
+    if not POST_URL_RE.match(url):
+        raise argparse.ArgumentTypeError(f"invalid Bluesky post URL: {url}")
+    return url
 
-def fetch_post(bsky: BskyClient, post_uri: str) -> dict:
-    """Fetch post content and metadata."""
-    parts = post_uri.replace('at://', '').split('/')
-    repo, collection, rkey = parts[0], parts[1], parts[2]
-    
-    post_record = bsky.com.atproto.repo.get_record({
-        'repo': repo,
-        'collection': collection,
-        'rkey': rkey
-    })
+def _get_posts_params(repo: str, rkey: str) -> dict:
+    """getPosts params for a single post; the AppView resolves handles in at:// URIs."""
+    return {'uris': [f"at://{repo}/app.bsky.feed.post/{rkey}"]}
+
+def _post_data(response, handle: str, rkey: str) -> dict:
+    """Pull the fields we need out of a getPosts response."""
+    if not response.posts:
+        raise ValueError(f"Post not found: {handle}/{rkey}")
+    post = response.posts[0]
     
-    profile = bsky.app.bsky.actor.get_profile({'actor': repo})
+    return {
+        'uri': post.uri,
+        'cid': post.cid,
+        'author_handle': post.author.handle,
+        'author_display_name': post.author.display_name or post.author.handle,
+        'text': post.record.text
+    }
+
+def fetch_post(bsky: BskyClient, handle: str, rkey: str) -> dict:
+    """Fetch post content and author metadata in a single getPosts call."""
+    return _post_data(bsky.app.bsky.feed.get_posts(_get_posts_params(handle, rkey)), handle, rkey)
+
+async def fetch_post_async(bsky: AsyncBskyClient, handle: str, rkey: str) -> dict:
+    """Async variant of fetch_post."""
+    return _post_data(await bsky.app.bsky.feed.get_posts(_get_posts_params(handle, rkey)), handle, rkey)
+
+def _is_decoration(c: str) -> bool:
+    """Whether a character is punctuation, an emoji/symbol, or an emoji joiner."""
+    if c in EMOJI_JOINERS:
+        return True
+    category = unicodedata.category(c)
+    return category in ('So', 'Sk') or category.startswith('P')
+
+def _is_emoji_only(text: str) -> bool:
+    """Whether text consists only of emoji (and joiners/whitespace), with at least one emoji."""
+    if EMOJI_RE is not None:
+        rest = EMOJI_RE.sub('', text)
+        if rest == text:
+            return False
+    else:
+        # Without regex, accept only the supplementary emoji blocks
+        # (pictographs, regional indicators, skin-tone modifiers)
+        rest = ''.join(c for c in text if not 0x1F000 <= ord(c) <= 0x1FAFF)
+        if len(rest) == len(text):
+            return False
+    return all(c in EMOJI_JOINERS or c.isspace() for c in rest)
+
+def _triage(text: str):
+    """Return a canned reply for trivially classifiable posts, or None."""
+    text = text.strip()
+    # Questions always go to the agent, however short
+    if not text or len(text) > TRIAGE_MAX_CHARS or '?' in text:
+        return None
+    if _is_emoji_only(text):
+        return EMOJI_ONLY_REPLY
+    bare = ''.join(c for c in EMOTICON_RE.sub(' ', text) if not _is_decoration(c)).strip()
+    for pattern, reply in TRIAGE_PATTERNS:
+        if pattern.fullmatch(bare):
+            return reply
+    return None
+
+def build_reply_prompt(post_data: dict) -> str:
+    """Build the agent prompt for replying to a post."""
+    handle, name, text = post_data['author_handle'], post_data['author_display_name'], post_data['text']
+    return f"{REPLY_PROMPT_PREFIX}Author: @{handle} ({name})\nPost: {text}"
+
+def _reply_chunk_text(chunk):
+    """Return the assistant text carried by a stream chunk, if any."""
+    if getattr(chunk, 'message_type', None) != 'assistant_message':
+        return None
+    return getattr(chunk, 'content', None)
+
+def _clip_graphemes(text: str, limit: int, force: bool = False) -> str:
+    """
+    Clip text to at most limit graphemes, preferring a word boundary, and end
+    it in '…'. Text within the limit is returned unchanged unless force is set
+    (e.g. because generation was cut off mid-word).
+    """
+    units = GRAPHEME_RE.findall(text) if GRAPHEME_RE else text
+    if len(units) <= limit and not force:
+        return text
+    clipped = ''.join(units[:limit - 1])
+    head, sep, _ = clipped.rpartition(' ')
+    if sep and head.strip():
+        clipped = head
+    return clipped.rstrip() + '…'
+
+def _finish_reply(reply_text: str, truncated: bool = False) -> str:
+    """
+    Validate the reply collected from the agent stream and clip it to length.
     
+    truncated marks a reply whose generation was stopped early; it is always
+    clipped, since its last word may be incomplete.
+    """
+    reply_text = reply_text.strip()
+    if not reply_text:
+        raise ValueError("Agent did not generate reply")
+    if truncated or len(reply_text.encode('utf-8')) > POST_GRAPHEME_LIMIT:
+        clipped = _clip_graphemes(reply_text, MAX_REPLY_CHARS, force=truncated)
+        if clipped is not reply_text:
+            logger.warning(f"⚠ Reply over {MAX_REPLY_CHARS} chars, clipped")
+        reply_text = clipped
+    return reply_text
+
+def _now_iso() -> str:
+    """Current UTC time as a record createdAt value."""
+    return datetime.now(timezone.utc).strftime(CREATED_AT_FORMAT)
+
+def build_reply_record(post_data: dict, reply_text: str, created_at: str | None = None) -> dict:
+    """Build the app.bsky.feed.post record replying to post_data."""
+    # Replies go to top-level posts, so root and parent are the same ref
+    ref = {'uri': post_data['uri'], 'cid': post_data['cid']}
     return {
-        'uri': post_uri,
-        'cid': post_record.cid,
-        'author_handle': profile.handle,
-        'author_display_name': profile.display_name or profile.handle,
-        'text': post_record.value.text
+        '$type': 'app.bsky.feed.post',
+        'text': reply_text,
+        'reply': {'root': ref, 'parent': ref},
+        'createdAt': created_at or _now_iso()
     }
 
-def reply_to_post(post_url: str):
+def _reply_url(username: str, record_uri: str) -> str:
+    """Web URL for a post we created."""
+    return f"https://bsky.app/profile/{username}/post/{record_uri.split('/')[-1]}"
+
+def reply_to_post(post_url: str, dry_run: bool = False):
     """
     Reply to a Bluesky post with proper threading.
     
@@ -72,7 +255,15 @@ def reply_to_post(post_url: str):
     1. Fetch post content via AT Protocol
     2. Invoke Letta agent to generate reply
     3. Post reply with parent/root references
+    
+    With dry_run, the post is read from the public AppView without logging in
+    and the generated reply is returned without being posted.
     """
+    import bsky_utils
+    from atproto import Client, models
+    from config_loader import get_letta_config, get_bluesky_config
+    from utils import get_letta_client
+    
     letta_config = get_letta_config()
     bsky_config = get_bluesky_config()
     
@@ -82,69 +273,71 @@ def reply_to_post(post_url: str):
     logger.info(f"📍 Target: {post_url}")
     
     # Setup Bluesky
-    bsky = BskyClient(base_url=bsky_config["pds_uri"])
-    bsky.login(bsky_config["username"], bsky_config["password"])
-    logger.info(f"✓ Logged in as @{bsky_config['username']}")
+    if dry_run:
+        bsky = Client(PUBLIC_APPVIEW_URL)
+        logger.info("🧪 Dry run: reading anonymously, nothing will be posted")
+    else:
+        # Reuses the saved session when possible, skipping the login round-trip
+        bsky = bsky_utils.init_client(
+            bsky_config["username"], bsky_config["password"], bsky_config["pds_uri"]
+        )
+        logger.info(f"✓ Logged in as @{bsky_config['username']}")
     
     # Get post details
     handle, rkey = parse_post_url(post_url)
-    post_uri = get_post_uri(handle, rkey)
-    post_data = fetch_post(bsky, post_uri)
-    logger.info(f"📖 @{post_data['author_handle']}: {post_data['text'][:80]}...")
-    
-    # Invoke agent to generate reply
-    logger.info(f"🤖 Invoking agent {agent_id[:8]} to generate reply...")
-    letta = Letta(api_key=api_key)
-    
-    prompt = f"""Generate a reply to this Bluesky post:
-
-Author: @{post_data['author_handle']} ({post_data['author_display_name']})
-Post: {post_data['text']}
-
-Return ONLY the reply text (max 280 chars). Match the tone and context:
-- Simple/casual posts (labeling, greetings, etc.) = concise, friendly responses
-- You can be playful and tongue-in-cheek when appropriate
-- Not everything needs deep elaboration - read the room
-- Use ascii emoticons sparingly and naturally"""
-
-    message_stream = letta.agents.messages.create(
-        agent_id=agent_id,
-        messages=[{"role": "user", "content": prompt}],
-        stream_tokens=False,
-        streaming=True
-    )
-    
-    # Extract reply text
-    reply_text = ""
-    for chunk in message_stream:
-        if hasattr(chunk, 'message_type') and chunk.message_type == 'assistant_message':
-            if hasattr(chunk, 'content'):
-                reply_text += chunk.content
-    
-    reply_text = reply_text.strip()
-    if not reply_text:
-        raise ValueError("Agent did not generate reply")
+    post_data = fetch_post(bsky, handle, rkey)
+    author, post_text = post_data['author_handle'], post_data['text']
+    logger.info(f"📖 @{author}: {post_text[:80]}...")
     
+    reply_text = _triage(post_text)
+    if reply_text:
+        logger.info("⚡ triaged, skipped agent")
+    else:
+        # Invoke agent to generate reply
+        logger.info(f"🤖 Invoking agent {agent_id[:8]} to generate reply...")
+        letta = get_letta_client(api_key)
+        
+        stream_tokens = letta_config['stream_tokens']
+        message_stream = letta.agents.messages.create(
+            agent_id=agent_id,
+            messages=[{"role": "user", "content": build_reply_prompt(post_data)}],
+            stream_tokens=stream_tokens,
+            streaming=True
+        )
+        
+        # Extract reply text; token deltas are joined once at the end
+        reply_parts = []
+        reply_len = 0
+        truncated = False
+        for chunk in message_stream:
+            text = _reply_chunk_text(chunk)
+            if text:
+                reply_parts.append(text)
+                reply_len += len(text)
+                # A reply this long can't be posted as-is; stop generating
+                if stream_tokens and reply_len >= POST_GRAPHEME_LIMIT:
+                    logger.warning(f"⚠ Reply reached {POST_GRAPHEME_LIMIT} chars, stopping generation")
+                    truncated = True
+                    break
+        
+        # Closing the stream cancels any upstream generation still in flight
+        if hasattr(message_stream, 'close'):
+            message_stream.close()
+        
+        reply_text = _finish_reply(''.join(reply_parts), truncated)
     logger.info(f"💬 Reply: {reply_text}")
     
-    # Post reply with threading
-    record = {
-        '$type': 'app.bsky.feed.post',
-        'text': reply_text,
-        'reply': {
-            'root': {'uri': post_data['uri'], 'cid': post_data['cid']},
-            'parent': {'uri': post_data['uri'], 'cid': post_data['cid']}
-        },
-        'createdAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-    }
+    if dry_run:
+        return {'success': True, 'reply_url': None, 'reply_text': reply_text}
     
-    response = bsky.com.atproto.repo.create_record({
-        'repo': bsky.me.did,
-        'collection': 'app.bsky.feed.post',
-        'record': record
-    })
+    # Post reply with threading
+    ref = models.ComAtprotoRepoStrongRef.Main(uri=post_data['uri'], cid=post_data['cid'])
+    response = bsky.send_post(
+        text=reply_text,
+        reply_to=models.AppBskyFeedPost.ReplyRef(root=ref, parent=ref)
+    )
     
-    reply_url = f"https://bsky.app/profile/{bsky_config['username']}/post/{response.uri.split('/')[-1]}"
+    reply_url = _reply_url(bsky_config['username'], response.uri)
     logger.info(f"✅ Posted: {reply_url}")
     
     return {
@@ -153,24 +346,172 @@ Return ONLY the reply text (max 280 chars). Match the tone and context:
         'reply_text': reply_text
     }
 
+async def _reply_one(bsky: AsyncBskyClient, letta, letta_config: dict,
+                     post_url: str, semaphore: asyncio.Semaphore) -> dict:
+    """Generate (but don't post) a reply to one URL using the batch's shared clients."""
+    async with semaphore:
+        logger.info(f"📍 Target: {post_url}")
+        handle, rkey = parse_post_url(post_url)
+        post_data = await fetch_post_async(bsky, handle, rkey)
+        author, post_text = post_data['author_handle'], post_data['text']
+        logger.info(f"📖 @{author}: {post_text[:80]}...")
+        
+        reply_text = _triage(post_text)
+        if reply_text:
+            logger.info("⚡ triaged, skipped agent")
+        else:
+            stream_tokens = letta_config['stream_tokens']
+            message_stream = await letta.agents.messages.create(
+                agent_id=letta_config['agent_id'],
+                messages=[{"role": "user", "content": build_reply_prompt(post_data)}],
+                stream_tokens=stream_tokens,
+                streaming=True
+            )
+            
+            reply_parts = []
+            reply_len = 0
+            truncated = False
+            async for chunk in message_stream:
+                text = _reply_chunk_text(chunk)
+                if text:
+                    reply_parts.append(text)
+                    reply_len += len(text)
+                    if stream_tokens and reply_len >= POST_GRAPHEME_LIMIT:
+                        logger.warning(f"⚠ Reply reached {POST_GRAPHEME_LIMIT} chars, stopping generation")
+                        truncated = True
+                        break
+            
+            if hasattr(message_stream, 'close'):
+                await message_stream.close()
+            
+            reply_text = _finish_reply(''.join(reply_parts), truncated)
+        logger.info(f"💬 Reply to @{author}: {reply_text}")
+        
+        return {
+            'success': True,
+            'post_url': post_url,
+            'reply_text': reply_text,
+            'post_data': post_data
+        }
+
+async def reply_to_posts_batch(urls: list[str], dry_run: bool = False) -> list:
+    """
+    Reply to several posts concurrently.
+    
+    Login and client construction happen once for the whole batch, replies are
+    generated concurrently, and every successful reply is then posted in a
+    single applyWrites call (skipped, along with login, under dry_run).
+    Returns one entry per URL, in order: the result dict, or the exception
+    that URL raised.
+    """
+    import bsky_utils
+    from atproto import AsyncClient, models
+    from config_loader import get_letta_config, get_bluesky_config
+    from utils import get_async_letta_client
+    
+    letta_config = get_letta_config()
+    bsky_config = get_bluesky_config()
+    
+    if dry_run:
+        bsky = AsyncClient(PUBLIC_APPVIEW_URL)
+        logger.info("🧪 Dry run: reading anonymously, nothing will be posted")
+    else:
+        bsky = await bsky_utils.init_async_client(
+            bsky_config["username"], bsky_config["password"], bsky_config["pds_uri"]
+        )
+        self_did = bsky.me.did
+        logger.info(f"✓ Logged in as @{bsky_config['username']}")
+    letta = get_async_letta_client(letta_config['api_key'])
+    
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_reply_one(bsky, letta, letta_config, url, semaphore) for url in urls],
+        return_exceptions=True
+    )
+    
+    ready = [i for i, r in enumerate(results) if not isinstance(r, BaseException)]
+    if dry_run:
+        for i in ready:
+            results[i].pop('post_data')
+            results[i]['reply_url'] = None
+        return results
+    
+    # One signed request per APPLY_WRITES_LIMIT replies instead of one
+    # create_record each. applyWrites is all-or-nothing, so a failure only
+    # fails the replies in its own chunk.
+    created_at = _now_iso()
+    for start in range(0, len(ready), APPLY_WRITES_LIMIT):
+        chunk = ready[start:start + APPLY_WRITES_LIMIT]
+        try:
+            response = await bsky.com.atproto.repo.apply_writes({
+                'repo': self_did,
+                'writes': [
+                    models.ComAtprotoRepoApplyWrites.Create(
+                        collection='app.bsky.feed.post',
+                        value=build_reply_record(results[i].pop('post_data'), results[i]['reply_text'], created_at)
+                    )
+                    for i in chunk
+                ]
+            })
+        except Exception as e:
+            logger.error(f"Failed to post {len(chunk)} batch replies: {e}")
+            for i in chunk:
+                results[i] = e
+            continue
+        
+        for i, write in zip(chunk, getattr(response, 'results', None) or []):
+            results[i]['reply_url'] = _reply_url(bsky_config['username'], write.uri)
+            logger.info(f"✅ Posted: {results[i]['reply_url']}")
+    
+    return results
+
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('url', nargs='?', type=_validate_url, help='Bluesky post URL to reply to')
+    parser.add_argument('--batch', nargs='+', type=_validate_url, metavar='URL',
+                        help='Reply to several posts concurrently over shared clients')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Generate replies without logging in to Bluesky or posting them')
+    args = parser.parse_args()
+    
+    if args.batch:
+        urls = ([args.url] if args.url else []) + args.batch
+        try:
+            results = asyncio.run(reply_to_posts_batch(urls, dry_run=args.dry_run))
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
+            traceback.print_exc()
+            sys.exit(1)
+        failed = 0
+        for post_url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"\n✗ {post_url}: {result}")
+            else:
+                print(f"\n✅ {post_url}")
+                print(f"💬 Reply: {result['reply_text']}")
+                if not args.dry_run:
+                    print(f"🔗 URL: {result.get('reply_url', '(unknown)')}")
+        sys.exit(1 if failed else 0)
     
-    post_url = sys.argv[1]
+    if not args.url:
+        parser.error('a post URL or --batch is required')
     
     try:
-        result = reply_to_post(post_url)
+        result = reply_to_post(args.url, dry_run=args.dry_run)
         if result['success']:
             print(f"\n✅ Success!")
             print(f"💬 Reply: {result['reply_text']}")
-            print(f"🔗 URL: {result['reply_url']}")
+            if args.dry_run:
+                print("🧪 Dry run, not posted")
+            else:
+                print(f"🔗 URL: {result['reply_url']}")
         else:
             print(f"\n❌ Failed: {result.get('error', 'Unknown error')}")
             sys.exit(1)
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
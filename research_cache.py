@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""SQLite-backed semantic cache of recent research findings."""
+
+import sqlite3
+import logging
+import importlib.util
+from array import array
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import json_utils
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers is optional; without it the cache is disabled. It pulls
+# in torch, so it is only imported once an embedding is actually needed.
+HAS_SENTENCE_TRANSFORMERS = importlib.util.find_spec("sentence_transformers") is not None
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class ResearchCache:
+    """
+    Cache of research results keyed by topic embedding.
+
+    A topic whose embedding is close enough to one researched within the TTL
+    is treated as a near-duplicate, letting the caller skip the agent call.
+    """
+
+    def __init__(self, db_path: str = "research_cache.db", threshold: float = 0.92, ttl_hours: int = 24):
+        """Initialize the research cache."""
+        self.db_path = Path(db_path)
+        self.threshold = threshold
+        self.ttl = timedelta(hours=ttl_hours)
+        self.conn = None
+        self._model = None
+        # Without an embedding model there is nothing to look up, so don't
+        # create the database file at all
+        if self.enabled:
+            self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS research_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic_id TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                result TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON research_cache(created_at DESC)
+        """)
+
+        self.conn.commit()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether an embedding model is available."""
+        return HAS_SENTENCE_TRANSFORMERS
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed text as a unit-length vector, loading the model on first use."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            logger.info(f"Loading embedding model {EMBEDDING_MODEL}")
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model.encode(text, normalize_embeddings=True).tolist()
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """Return the cached result for the most similar recent topic, if above threshold."""
+        if not self.enabled:
+            return None
+
+        query = self._embed(text)
+        cutoff = (datetime.now(timezone.utc) - self.ttl).isoformat()
+        rows = self.conn.execute(
+            "SELECT topic_id, embedding, result FROM research_cache WHERE created_at > ?",
+            (cutoff,)
+        ).fetchall()
+
+        best_score, best_row = 0.0, None
+        for row in rows:
+            embedding = array('f')
+            embedding.frombytes(row['embedding'])
+            # Both vectors are normalized, so the dot product is cosine similarity
+            score = sum(a * b for a, b in zip(query, embedding))
+            if score > best_score:
+                best_score, best_row = score, row
+
+        if best_row is None or best_score < self.threshold:
+            return None
+
+        logger.info(f"Research cache hit: {best_row['topic_id']} (similarity {best_score:.3f})")
+        return json_utils.loads(best_row['result'])
+
+    def store(self, text: str, topic_id: str, result: Dict) -> None:
+        """Cache a research result under the embedding of its topic text."""
+        if not self.enabled:
+            return
+
+        embedding = array('f', self._embed(text)).tobytes()
+        self.conn.execute(
+            "INSERT INTO research_cache (topic_id, embedding, result, created_at) VALUES (?, ?, ?, ?)",
+            (topic_id, embedding, json_utils.dumps(result).decode('utf-8'),
+             datetime.now(timezone.utc).isoformat())
+        )
+        # Expired rows can never be hits again
+        self.conn.execute(
+            "DELETE FROM research_cache WHERE created_at <= ?",
+            ((datetime.now(timezone.utc) - self.ttl).isoformat(),)
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close database connection."""
+        if self.conn:
+            self.conn.close()
@@ -4,14 +4,20 @@ Setup script for social-agents framework.
 Imports the example agent and creates config.yaml if needed.
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
 from pathlib import Path
-import yaml
+from typing import TYPE_CHECKING
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
-from letta_client import Letta
+
+# letta_client and yaml are imported where they're used so the early exits
+# (existing config, missing API key) don't pay for them
+if TYPE_CHECKING:
+    from letta_client import Letta
 
 console = Console()
 
@@ -53,6 +59,12 @@ def import_example_agent(client: Letta) -> str:
 
 def create_config(agent_id: str, letta_api_key: str = None):
     """Create a basic config.yaml file."""
+    import yaml
+    try:
+        from yaml import CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeDumper
+
     console.print("\n[bold cyan]Setting up configuration...[/bold cyan]")
 
     # Prompt for Bluesky credentials
@@ -85,7 +97,7 @@ def create_config(agent_id: str, letta_api_key: str = None):
         Path('configs').mkdir(exist_ok=True)
         
         with open('configs/config.yaml', 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
 
         console.print(f"\n[green]✓ Created configs/config.yaml[/green]")
         console.print("\n[yellow]Important:[/yellow] Edit config.yaml and add your LETTA_API_KEY")
@@ -129,6 +141,8 @@ def main():
     # Ask if they want to import the example agent
     console.print("\n[cyan]This will import the example agent to your Letta account.[/cyan]")
     if Confirm.ask("Import example agent?", default=True):
+        from letta_client import Letta
+
         # Create Letta client
         try:
             client = Letta(api_key=letta_api_key)
@@ -1,5 +1,47 @@
-from letta_client import Letta
-from typing import Optional
+import functools
+import hashlib
+from letta_client import Letta, AsyncLetta
+from typing import Optional, Tuple
+
+@functools.lru_cache(maxsize=4)
+def get_letta_client(api_key: str) -> Letta:
+    """
+    Return a Letta client for this API key, reusing one already built in this
+    process so repeated invocations share its HTTP connection pool.
+    """
+    return Letta(api_key=api_key)
+
+@functools.lru_cache(maxsize=4)
+def get_async_letta_client(api_key: str) -> AsyncLetta:
+    """
+    Async counterpart of get_letta_client. The underlying connection pool is
+    bound to the event loop it is first used on, so use it from a single loop.
+    """
+    return AsyncLetta(api_key=api_key)
+
+def build_memory_pack(letta: Letta, agent_id: str, query: str, k: int = 20) -> Tuple[str, str]:
+    """
+    Fetch the top-k archival passages for a query and render them as a stable
+    block for prompt injection.
+
+    Passages are ordered by ID rather than relevance so the same memory set
+    always renders to the same text. Returns (text, version_hash).
+    """
+    # SDK v1.0 returns page object
+    passages_page = letta.agents.passages.list(agent_id=agent_id, search=query, limit=k)
+    passages = passages_page.items if hasattr(passages_page, 'items') else passages_page
+
+    text = "\n".join(
+        f"- {passage.text}"
+        for passage in sorted(passages, key=lambda p: p.id)
+        if passage.text
+    )
+    version = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+    return text, version
+
+def format_memory_pack(text: str, version: str) -> str:
+    """Wrap a memory pack in the tagged block the autonomous prompts expect."""
+    return f"<memory v={version}>\n{text}\n</memory>"
 
 def upsert_block(letta: Letta, label: str, value: str, **kwargs):
     """